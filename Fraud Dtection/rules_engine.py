@@ -3,6 +3,19 @@
 # A compulsory list of 45 rules/facts to detect electoral fraud anomalies.
 # Each rule has a unique ID, a description, a severity score (1-10), and a function to test it.
 
+# The fields of a polling unit record that the rules read (the columns of fraud_mock_data.csv, minus the label).
+RECORD_FIELDS = [
+    "registered_voters", "accredited_voters", "votes_cast", "valid_votes",
+    "pdp_votes", "apc_votes", "lp_votes", "other_votes",
+    "turnout_percentage", "historical_turnout", "estimated_population",
+    "unit_win_margin", "neighbor_avg_win_margin", "winning_margin_abs", "historical_win_margin_abs",
+    "fails_benfords_law", "submission_delay_hours", "form_ec8a_missing_or_altered", "bvas_malfunction",
+    "reports_of_violence", "opening_delay_hours", "party_agents_absent", "ballot_box_snatching",
+    "security_personnel_present", "results_publicly_posted", "manual_accreditation_alteration",
+    "agents_refused_signing", "observer_flags_irregularity", "observer_counts_mismatch",
+    "observers_present", "reports_of_vote_buying", "neighbor_registered_voters",
+]
+
 RULES = [
     # --- Turnout & Registration Anomalies (T) ---
     {"id": "T01", "severity": 10, "description": "Turnout exceeds 100% of registered voters.", "test": lambda r: r['votes_cast'] > r['registered_voters']},
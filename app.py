@@ -2,7 +2,8 @@
 import streamlit as st
 import pandas as pd
 import joblib
-from rules_engine import RULES, evaluate_rules
+from rules_engine import RULES, RECORD_FIELDS
+from risk_explainer import RiskExplainer, evaluate_rules_matrix
 import plotly.graph_objects as go
 
 # --- Page Config ---
@@ -14,6 +15,7 @@ try:
 except FileNotFoundError:
     st.error("Model not found. Please run `train_fraud_model.py` first.")
     st.stop()
+explainer = RiskExplainer(model)
 
 # --- Sidebar Inputs ---
 with st.sidebar:
@@ -74,22 +76,14 @@ if analyze_button:
     }
 
     # --- 2. Run the Rule Engine ---
-    violated_rules = evaluate_rules(user_record)
+    violations = evaluate_rules_matrix([user_record])
+    violated_rules = [rule for rule, violated in zip(RULES, violations[0]) if violated]
     
-    # --- 3. Create Features for the ML Model ---
-    model_features = pd.DataFrame([{
-        'num_violations': len(violated_rules),
-        'max_severity': max([r['severity'] for r in violated_rules]) if violated_rules else 0,
-        'total_severity': sum([r['severity'] for r in violated_rules]),
-        'num_turnout_violations': len([r for r in violated_rules if r['id'].startswith('T')]),
-        'num_voting_violations': len([r for r in violated_rules if r['id'].startswith('V')]),
-        'num_procedural_violations': len([r for r in violated_rules if r['id'].startswith('P')]),
-    }])
+    # --- 3. Get Prediction and Explanation from ML Model ---
+    explanation = explainer.explain_violations(violations).iloc[0]
+    risk_probability = explanation['risk_probability'] # Probability of class '1' (fraud)
 
-    # --- 4. Get Prediction from ML Model ---
-    risk_probability = model.predict_proba(model_features)[0][1] # Probability of class '1' (fraud)
-
-    # --- 5. Display Results ---
+    # --- 4. Display Results ---
     st.header("Analysis Results")
     
     # Determine color and risk level based on probability
@@ -126,4 +120,30 @@ if analyze_button:
         st.dataframe(df_violations.style.apply(
             lambda x: ['background-color: #FF4B4B' if x.severity > 7 else ('background-color: #FFA500' if x.severity > 4 else '') for i in x],
             axis=1
-        ))
\ No newline at end of file
+        ))
+
+        st.subheader("Top Risk Drivers")
+        st.markdown("The triggered indicators that raise the log-odds of fraud the most, relative to a unit with no violations.")
+        descriptions = {rule['id']: rule['description'] for rule in RULES}
+        drivers = [
+            {'id': explanation[f'driver_{k}'], 'contribution': round(explanation[f'driver_{k}_contribution'], 3),
+             'description': descriptions[explanation[f'driver_{k}']]}
+            for k in range(1, explainer.top_k + 1) if pd.notna(explanation[f'driver_{k}'])
+        ]
+        if drivers:
+            st.dataframe(pd.DataFrame(drivers))
+        else:
+            st.info("None of the triggered indicators raise the risk score on their own.")
+
+# --- Bulk Analysis ---
+st.header("Bulk Analysis")
+uploaded_file = st.file_uploader("Upload a CSV of polling unit results to score and explain them in one batch", type="csv")
+if uploaded_file is not None:
+    df_units = pd.read_csv(uploaded_file)
+    missing_columns = [c for c in RECORD_FIELDS if c not in df_units.columns]
+    if missing_columns:
+        st.error(f"The uploaded file is missing required columns: {', '.join(missing_columns)}")
+        st.stop()
+    df_scored = pd.concat([df_units, explainer.explain(df_units)], axis=1)
+    st.dataframe(df_scored)
+    st.download_button("Download Scored Results", df_scored.to_csv(index=False), "scored_units.csv", "text/csv")
\ No newline at end of file
@@ -0,0 +1,140 @@
+# risk_explainer.py
+
+# Vectorized explanation of the ML risk score.
+# The model is a logistic regression over six features that are all derived from the violated rules,
+# so the log-odds of every unit in a batch can be split exactly across its features and its violated rules.
+
+import numpy as np
+import pandas as pd
+from rules_engine import RULES, evaluate_rules
+
+# Model features, in the order used by train_fraud_model.py
+FEATURE_NAMES = [
+    'num_violations', 'max_severity', 'total_severity',
+    'num_turnout_violations', 'num_voting_violations', 'num_procedural_violations',
+]
+MAX_SEVERITY = FEATURE_NAMES.index('max_severity')
+
+RULE_IDS = np.array([rule['id'] for rule in RULES])
+RULE_INDEX = {rule['id']: i for i, rule in enumerate(RULES)}
+SEVERITIES = np.array([rule['severity'] for rule in RULES])
+
+# How much a single violation of each rule adds to each feature (rules x features).
+# max_severity is not additive, so its column is left at zero and handled separately.
+RULE_FEATURES = np.zeros((len(RULES), len(FEATURE_NAMES)))
+RULE_FEATURES[:, FEATURE_NAMES.index('num_violations')] = 1
+RULE_FEATURES[:, FEATURE_NAMES.index('total_severity')] = SEVERITIES
+RULE_FEATURES[:, FEATURE_NAMES.index('num_turnout_violations')] = [r['id'].startswith('T') for r in RULES]
+RULE_FEATURES[:, FEATURE_NAMES.index('num_voting_violations')] = [r['id'].startswith('V') for r in RULES]
+RULE_FEATURES[:, FEATURE_NAMES.index('num_procedural_violations')] = [r['id'].startswith('P') for r in RULES]
+
+
+def evaluate_rules_matrix(records):
+    """
+    Runs a list of data records (dicts) through all the rules and returns a boolean
+    matrix of shape (records, rules) marking the violations.
+    """
+    violations = np.zeros((len(records), len(RULES)), dtype=bool)
+    for row, record in enumerate(records):
+        for rule in evaluate_rules(record):
+            violations[row, RULE_INDEX[rule['id']]] = True
+    return violations
+
+
+def build_features(violations):
+    """
+    Builds the model features for a whole batch from its violation matrix.
+    """
+    features = violations @ RULE_FEATURES
+    features[:, MAX_SEVERITY] = (violations * SEVERITIES).max(axis=1, initial=0)
+    return pd.DataFrame(features, columns=FEATURE_NAMES)
+
+
+class RiskExplainer:
+    """
+    Explains the fraud model's risk score for a batch of polling units.
+
+    Contributions are measured in log-odds against a unit with no violations (all features zero),
+    so for every unit: intercept + sum of contributions == log-odds of fraud.
+    """
+
+    def __init__(self, model, top_k=3):
+        if model.coef_.shape != (1, len(FEATURE_NAMES)):
+            raise ValueError(f"Expected a binary model over {len(FEATURE_NAMES)} features, got coefficients of shape {model.coef_.shape}.")
+        feature_names = getattr(model, 'feature_names_in_', FEATURE_NAMES)
+        if set(feature_names) != set(FEATURE_NAMES):
+            raise ValueError(f"Model features {list(feature_names)} do not match the explainer features {FEATURE_NAMES}.")
+        coef = pd.Series(model.coef_[0], index=feature_names)
+        self.coef = coef[FEATURE_NAMES].to_numpy()
+        self.intercept = model.intercept_[0]
+        self.top_k = top_k
+        # Log-odds each rule adds through the additive features, cached once per model
+        self.rule_marginals = RULE_FEATURES @ self.coef
+
+    def feature_contributions(self, features):
+        """Per-feature contributions to the log-odds (units x features)."""
+        return features.to_numpy(dtype=float) * self.coef
+
+    def rule_contributions(self, violations):
+        """
+        Per-rule contributions to the log-odds (units x rules).
+        The max_severity term is shared equally between the violated rules that reach the maximum.
+        """
+        contributions = violations * self.rule_marginals
+        max_severity = (violations * SEVERITIES).max(axis=1, initial=0, keepdims=True)
+        at_max = violations & (SEVERITIES == max_severity)
+        ties = np.maximum(at_max.sum(axis=1, keepdims=True), 1)
+        contributions += at_max * (self.coef[MAX_SEVERITY] * max_severity / ties)
+        return contributions
+
+    def top_drivers(self, violations, rule_contributions):
+        """
+        Returns, for each unit, the top-k violated rules that raise the log-odds the most.
+        Rules that lower the risk are never drivers; unused slots are NaN.
+        """
+        drives = violations & (rule_contributions > 0)
+        strength = np.where(drives, rule_contributions, -np.inf)
+        order = np.argsort(-strength, axis=1, kind='stable')[:, :self.top_k]
+        fired = np.take_along_axis(drives, order, axis=1)
+        ids = RULE_IDS[order].astype(object)
+        ids[~fired] = np.nan
+        values = np.where(fired, np.take_along_axis(rule_contributions, order, axis=1), np.nan)
+
+        drivers = {}
+        for k in range(order.shape[1]):
+            drivers[f'driver_{k + 1}'] = ids[:, k]
+            drivers[f'driver_{k + 1}_contribution'] = values[:, k]
+        return pd.DataFrame(drivers)
+
+    def explain(self, records):
+        """
+        Scores a batch of records (a DataFrame or a list of dicts) and explains each score.
+
+        Returns one row per record with the risk probability, the log-odds, the per-feature
+        contributions and the top-k driving rules.
+        """
+        if isinstance(records, pd.DataFrame):
+            index = records.index
+            records = records.to_dict('records')
+        else:
+            index = None
+        return self.explain_violations(evaluate_rules_matrix(records), index)
+
+    def explain_violations(self, violations, index=None):
+        """
+        Same as explain(), for a violation matrix that has already been evaluated.
+        """
+        features = build_features(violations)
+        feature_contributions = self.feature_contributions(features)
+        log_odds = self.intercept + feature_contributions.sum(axis=1)
+
+        result = pd.DataFrame({
+            'risk_probability': 1 / (1 + np.exp(-log_odds)),
+            'log_odds': log_odds,
+        })
+        for i, name in enumerate(FEATURE_NAMES):
+            result[f'{name}_contribution'] = feature_contributions[:, i]
+        result = pd.concat([result, self.top_drivers(violations, self.rule_contributions(violations))], axis=1)
+        if index is not None:
+            result.index = index
+        return result
\ No newline at end of file
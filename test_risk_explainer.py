@@ -0,0 +1,106 @@
+# test_risk_explainer.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from rules_engine import RULES
+from risk_explainer import FEATURE_NAMES, MAX_SEVERITY, RULE_INDEX, RiskExplainer, build_features, evaluate_rules_matrix
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "fraud_mock_data.csv")
+
+
+def random_violations(n, seed=0):
+    return np.random.default_rng(seed).random((n, len(RULES))) < 0.1
+
+
+def violations_for(*rule_ids):
+    violations = np.zeros((1, len(RULES)), dtype=bool)
+    for rule_id in rule_ids:
+        violations[0, RULE_INDEX[rule_id]] = True
+    return violations
+
+
+@pytest.fixture(scope="module")
+def model():
+    features = build_features(random_violations(400))
+    labels = (features['total_severity'] + np.random.default_rng(1).normal(0, 5, len(features))) > 25
+    return LogisticRegression().fit(features, labels)
+
+
+def test_probability_matches_model(model):
+    df = pd.read_csv(DATA_PATH).head(200)
+    result = RiskExplainer(model).explain(df)
+    features = build_features(evaluate_rules_matrix(df.to_dict('records')))
+    assert list(result.index) == list(df.index)
+    np.testing.assert_allclose(result['risk_probability'], model.predict_proba(features)[:, 1], atol=1e-12)
+
+
+def test_contributions_sum_to_log_odds(model):
+    explainer = RiskExplainer(model)
+    violations = random_violations(300, seed=2)
+    features = build_features(violations)
+    log_odds = model.decision_function(features)
+
+    result = explainer.explain_violations(violations)
+    np.testing.assert_allclose(result['log_odds'], log_odds, atol=1e-12)
+    feature_sum = result[[f'{name}_contribution' for name in FEATURE_NAMES]].sum(axis=1)
+    np.testing.assert_allclose(explainer.intercept + feature_sum, log_odds, atol=1e-12)
+    rule_sum = explainer.rule_contributions(violations).sum(axis=1)
+    np.testing.assert_allclose(explainer.intercept + rule_sum, log_odds, atol=1e-12)
+
+
+def test_max_severity_is_split_between_tied_rules(model):
+    explainer = RiskExplainer(model)
+    # T01 and V07 both have severity 10, P05 has severity 5
+    violations = violations_for('T01', 'V07', 'P05')
+    contributions = explainer.rule_contributions(violations)[0]
+    share = explainer.coef[MAX_SEVERITY] * 10 / 2
+    for rule_id in ('T01', 'V07'):
+        i = RULE_INDEX[rule_id]
+        assert contributions[i] == pytest.approx(explainer.rule_marginals[i] + share)
+    i = RULE_INDEX['P05']
+    assert contributions[i] == pytest.approx(explainer.rule_marginals[i])
+
+
+def test_empty_batch(model):
+    explainer = RiskExplainer(model)
+    result = explainer.explain([])
+    assert len(result) == 0
+    assert 'driver_3' in result.columns
+    assert len(explainer.explain_violations(np.zeros((0, len(RULES)), dtype=bool))) == 0
+
+
+def test_fewer_violations_than_drivers(model):
+    explainer = RiskExplainer(model)
+    violations = np.vstack([violations_for(), violations_for('T01')])
+    explainer.coef = np.ones(len(FEATURE_NAMES))
+    explainer.rule_marginals = np.ones(len(RULES))
+    result = explainer.explain_violations(violations)
+    assert result[['driver_1', 'driver_2', 'driver_3']].iloc[0].isna().all()
+    assert result['driver_1'].iloc[1] == 'T01'
+    assert result[['driver_2', 'driver_3']].iloc[1].isna().all()
+    assert result[['driver_2_contribution', 'driver_3_contribution']].iloc[1].isna().all()
+
+
+def test_rules_lowering_risk_are_not_drivers(model):
+    explainer = RiskExplainer(model)
+    explainer.coef = np.zeros(len(FEATURE_NAMES))
+    explainer.rule_marginals = np.zeros(len(RULES))
+    explainer.rule_marginals[RULE_INDEX['T01']] = -2.0
+    explainer.rule_marginals[RULE_INDEX['V02']] = 0.5
+    explainer.rule_marginals[RULE_INDEX['P01']] = 1.5
+    result = explainer.explain_violations(violations_for('T01', 'V02', 'P01')).iloc[0]
+    assert [result['driver_1'], result['driver_2']] == ['P01', 'V02']
+    assert pd.isna(result['driver_3'])
+
+
+def test_rejects_mismatched_features():
+    features = build_features(random_violations(100)).rename(columns={'max_severity': 'peak_severity'})
+    labels = features['total_severity'] > 10
+    with pytest.raises(ValueError):
+        RiskExplainer(LogisticRegression().fit(features, labels))
+
+    features = build_features(random_violations(100)).assign(extra=1.0)
+    with pytest.raises(ValueError):
+        RiskExplainer(LogisticRegression().fit(features, labels))
\ No newline at end of file
@@ -4,29 +4,16 @@ from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report
 import joblib
-from rules_engine import evaluate_rules
+from risk_explainer import evaluate_rules_matrix, build_features
 
 print("Loading data...")
 df = pd.read_csv("fraud_mock_data.csv")
 
 # --- Feature Engineering using the Rule Engine ---
+# Features are built by the same code the app's explainer uses, so training and scoring stay in sync
 print("Applying rules engine to generate features...")
-features = []
-for index, row in df.iterrows():
-    record_dict = row.to_dict()
-    violated_rules = evaluate_rules(record_dict)
-    
-    # Create features based on the violations
-    features.append({
-        'num_violations': len(violated_rules),
-        'max_severity': max([r['severity'] for r in violated_rules]) if violated_rules else 0,
-        'total_severity': sum([r['severity'] for r in violated_rules]),
-        'num_turnout_violations': len([r for r in violated_rules if r['id'].startswith('T')]),
-        'num_voting_violations': len([r for r in violated_rules if r['id'].startswith('V')]),
-        'num_procedural_violations': len([r for r in violated_rules if r['id'].startswith('P')]),
-    })
-
-df_features = pd.DataFrame(features)
+violations = evaluate_rules_matrix(df.to_dict('records'))
+df_features = build_features(violations)
 print("Feature generation complete.")
 
 # --- Model Training ---